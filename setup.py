@@ -13,6 +13,7 @@ setup(
     install_requires=[
         "langchain>=0.2.14",
         "torch>=2.4.0",
+        "numpy",
     ],
     python_requires=">=3.12",
     classifiers=[
@@ -0,0 +1,235 @@
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from threading import Lock
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Union
+from ..core.cancellation import current_token
+from ..core.reducers import apply_result
+from ..core.states import State
+from .llm import TextAgent
+
+class CascadeAgent:
+    """
+    Routing agent that composes several TextAgents into a cascade.
+
+    Each request is sent to the first (fastest, cheapest) agent. Its output is
+    scored by a validator and only escalated to the next agent in the list when
+    the score falls below the threshold or the agent raises. Optionally, the
+    next agent is started as a hedge when the current one has not answered
+    within `hedge_after` seconds.
+
+    Design:
+    State ───► Cheap ──(rejected / slow)──► Mid ──(rejected / slow)──► Expensive
+                 │                           │                            │
+                 └────────── accepted ───────┴──────────── accepted ──────┴──► State
+    """
+
+    def __init__(
+        self,
+        agents: List[TextAgent],
+        validator: Optional[Callable[[State], Union[bool, float]]] = None,
+        threshold: float = 0.5,
+        hedge_after: Optional[float] = None,
+        result_key: str = "text_result",
+        history_size: int = 1000
+    ) -> None:
+        """
+        Initialize the CascadeAgent.
+
+        Args:
+            agents (List[TextAgent]): Agents ordered from cheapest to most expensive.
+            validator (Optional[Callable[[State], Union[bool, float]]]): Scores an agent's output state.
+                Returns a bool or a confidence in [0, 1]. Defaults to checking that `result_key` is non-empty.
+            threshold (float): Minimum validator score for a result to be accepted. Default is 0.5.
+            hedge_after (Optional[float]): Seconds to wait on an agent before also starting the next one.
+                None disables hedging.
+            result_key (str): State key inspected by the default validator. Default is "text_result".
+            history_size (int): Number of recent validator scores kept per agent for threshold tuning.
+
+        Raises:
+            ValueError: If no agents are given.
+        """
+        if not agents:
+            raise ValueError("CascadeAgent requires at least one agent.")
+        self.agents: List[TextAgent] = agents
+        self.validator: Callable[[State], Union[bool, float]] = validator or self._default_validator
+        self.threshold: float = threshold
+        self.hedge_after: Optional[float] = hedge_after
+        self.result_key: str = result_key
+        self.history_size: int = history_size
+        self._lock = Lock()
+        self.reset_stats()
+
+    def _default_validator(self, state: State) -> bool:
+        return bool(state.get(self.result_key))
+
+    def invoke(self, state: State) -> State:
+        """
+        Route the given state through the cascade and return the first accepted state.
+
+        Every agent works on its own copy of the input state, so rejected and
+        hedged attempts never leak into the returned state.
+
+        Args:
+            state (State): The current state containing input data.
+
+        Returns:
+            State: The state produced by the cheapest agent whose output was accepted.
+                If no output is accepted, the output of the most expensive agent that answered.
+
+        Raises:
+            DeadlineExceeded: If the current request's deadline passes or it is cancelled.
+            Exception: The last error raised if every agent in the cascade failed.
+        """
+        token = current_token()
+        executor = ThreadPoolExecutor(max_workers=len(self.agents))
+        pending: Dict[Future, int] = {}
+        started: Dict[int, float] = {}
+        inputs: Dict[int, State] = {}
+        fallback: Optional[State] = None
+        fallback_tier: int = -1
+        last_error: Optional[BaseException] = None
+        next_tier: int = 0
+        hedge_tiers: Set[int] = set()
+
+        def launch(hedge: bool = False) -> None:
+            nonlocal next_tier
+            tier = next_tier
+            next_tier += 1
+            if hedge:
+                hedge_tiers.add(tier)
+            started[tier] = time.monotonic()
+            inputs[tier] = state.copy()
+            # Run in a copy of the caller's context, so agents see the request's cancellation token.
+            pending[executor.submit(copy_context().run, self.agents[tier].invoke, inputs[tier])] = tier
+
+        with self._lock:
+            self._stats["requests"] += 1
+
+        try:
+            launch()
+            while pending:
+                if token is not None:
+                    token.check()
+                can_hedge = self.hedge_after is not None and next_tier < len(self.agents)
+                timeout = None
+                if can_hedge:
+                    timeout = max(0.0, started[next_tier - 1] + self.hedge_after - time.monotonic())
+                if token is not None:
+                    timeout = token.wait_timeout(timeout)
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    if can_hedge and time.monotonic() - started[next_tier - 1] >= self.hedge_after:
+                        self._record("hedges")
+                        launch(hedge=True)
+                    continue
+
+                escalate = False
+                for future in sorted(done, key=lambda f: pending[f]):
+                    tier = pending.pop(future)
+                    latency = time.monotonic() - started[tier]
+                    try:
+                        result = apply_result(inputs[tier], future.result())
+                    except Exception as error:
+                        last_error = error
+                        self._record_tier(tier, "errors", latency)
+                        escalate = True
+                        continue
+
+                    score = float(self.validator(result))
+                    if score >= self.threshold:
+                        self._record_tier(tier, "accepted", latency, score)
+                        self._record_acceptance(tier, tier in hedge_tiers)
+                        return result
+
+                    self._record_tier(tier, "rejected", latency, score)
+                    if tier > fallback_tier:
+                        fallback, fallback_tier = result, tier
+                    escalate = True
+
+                if escalate and next_tier < len(self.agents) and (next_tier - 1) not in pending.values():
+                    self._record("escalations")
+                    launch()
+        finally:
+            executor.shutdown(wait=False)
+
+        if fallback is not None:
+            self._record("exhausted")
+            return fallback
+        self._record("failures")
+        raise last_error
+
+    def _record(self, counter: str) -> None:
+        with self._lock:
+            self._stats[counter] += 1
+
+    def _record_tier(self, tier: int, outcome: str, latency: float, score: Optional[float] = None) -> None:
+        with self._lock:
+            tier_stats = self._stats["tiers"][tier]
+            tier_stats["calls"] += 1
+            tier_stats[outcome] += 1
+            tier_stats["total_latency"] += latency
+            if score is not None:
+                tier_stats["scores"].append(score)
+
+    def _record_acceptance(self, tier: int, hedged: bool) -> None:
+        with self._lock:
+            self._stats["accepted_by"][tier] += 1
+            if hedged:
+                self._stats["hedge_wins"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get a snapshot of the routing statistics.
+
+        Per-tier entries report call counts, outcomes, mean latency and the
+        most recent validator scores, which can be used to tune `threshold`
+        and `hedge_after` from production traffic.
+
+        Returns:
+            Dict[str, Any]: The routing statistics.
+        """
+        with self._lock:
+            tiers = []
+            for agent, tier_stats in zip(self.agents, self._stats["tiers"]):
+                calls = tier_stats["calls"]
+                tiers.append({
+                    "model_name": getattr(agent, "model_name", type(agent).__name__),
+                    "calls": calls,
+                    "accepted": tier_stats["accepted"],
+                    "rejected": tier_stats["rejected"],
+                    "errors": tier_stats["errors"],
+                    "mean_latency": tier_stats["total_latency"] / calls if calls else 0.0,
+                    "scores": list(tier_stats["scores"]),
+                })
+            return {
+                "requests": self._stats["requests"],
+                "escalations": self._stats["escalations"],
+                "hedges": self._stats["hedges"],
+                "hedge_wins": self._stats["hedge_wins"],
+                "exhausted": self._stats["exhausted"],
+                "failures": self._stats["failures"],
+                "accepted_by": list(self._stats["accepted_by"]),
+                "tiers": tiers,
+            }
+
+    def reset_stats(self) -> None:
+        """
+        Reset all routing statistics.
+        """
+        with self._lock:
+            self._stats: Dict[str, Any] = {
+                "requests": 0,
+                "escalations": 0,
+                "hedges": 0,
+                "hedge_wins": 0,
+                "exhausted": 0,
+                "failures": 0,
+                "accepted_by": [0] * len(self.agents),
+                "tiers": [self._empty_tier_stats() for _ in self.agents],
+            }
+
+    def _empty_tier_stats(self) -> Dict[str, Any]:
+        scores: Deque[float] = deque(maxlen=self.history_size)
+        return {"calls": 0, "accepted": 0, "rejected": 0, "errors": 0, "total_latency": 0.0, "scores": scores}
@@ -0,0 +1,312 @@
+import hashlib
+import io
+import mmap
+import os
+import wave
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Union
+import numpy as np
+from ..core.states import State, StateDelta
+
+MediaSource = Union[str, os.PathLike, bytes, bytearray, memoryview]
+
+class MediaCache:
+    """
+    Size-bounded LRU cache of decoded media arrays keyed by content hash.
+
+    Cached arrays are read-only, so the same buffer can be handed to every
+    agent that needs it without defensive copies.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024) -> None:
+        """
+        Initialize the MediaCache.
+
+        Args:
+            max_bytes (int): Maximum total size of the cached arrays. Default is 512 MiB.
+        """
+        self.max_bytes: int = max_bytes
+        self.current_bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """
+        Get a cached array and mark it as recently used.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[np.ndarray]: The cached array, or None on a miss.
+        """
+        with self._lock:
+            array = self._entries.get(key)
+            if array is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return array
+
+    def put(self, key: str, array: np.ndarray) -> None:
+        """
+        Cache an array, evicting the least recently used entries to stay within `max_bytes`.
+        Arrays larger than `max_bytes` are not cached.
+
+        Args:
+            key (str): The cache key.
+            array (np.ndarray): A read-only array.
+        """
+        if array.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous.nbytes
+            while self._entries and self.current_bytes + array.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+                self.evictions += 1
+            self._entries[key] = array
+            self.current_bytes += array.nbytes
+
+    def clear(self) -> None:
+        """Remove all cached arrays."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict[str, int]: Entry count, cached bytes, hits, misses and evictions.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+@contextmanager
+def open_media(source: MediaSource) -> Iterator[Union[mmap.mmap, memoryview]]:
+    """
+    Expose a media source as a read-only buffer without copying it.
+
+    File paths are memory-mapped; in-memory bytes are wrapped in a memoryview.
+
+    Args:
+        source (MediaSource): A file path or the raw encoded bytes.
+
+    Yields:
+        Union[mmap.mmap, memoryview]: The encoded media.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield memoryview(source)
+        return
+    with open(source, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield memoryview(b"")
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+
+def decode_image(buffer: Union[mmap.mmap, memoryview], size: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    """
+    Decode an encoded image into a normalized RGB float32 array.
+
+    Args:
+        buffer (Union[mmap.mmap, memoryview]): The encoded image.
+        size (Optional[Tuple[int, int]]): Target (width, height). None keeps the original size.
+
+    Returns:
+        np.ndarray: An array of shape (height, width, 3) with values in [0, 1].
+
+    Raises:
+        ImportError: If Pillow is not installed.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ImportError("Image decoding requires Pillow. Install it with `pip install pillow`.")
+
+    stream = buffer if isinstance(buffer, mmap.mmap) else io.BytesIO(buffer)
+    with Image.open(stream) as image:
+        image = image.convert("RGB")
+        if size is not None and image.size != tuple(size):
+            image = image.resize(size)
+        return np.asarray(image, dtype=np.float32) / 255.0
+
+def decode_audio(buffer: Union[mmap.mmap, memoryview], sample_rate: Optional[int] = None) -> np.ndarray:
+    """
+    Decode a PCM WAV file into a normalized mono float32 array.
+
+    Args:
+        buffer (Union[mmap.mmap, memoryview]): The encoded audio.
+        sample_rate (Optional[int]): Target sample rate. None keeps the original rate.
+
+    Returns:
+        np.ndarray: A 1-D array of samples in [-1, 1].
+
+    Raises:
+        ValueError: If the sample width is not supported.
+    """
+    stream = buffer if isinstance(buffer, mmap.mmap) else io.BytesIO(buffer)
+    stream.seek(0)
+    with wave.open(stream, "rb") as reader:
+        channels = reader.getnchannels()
+        width = reader.getsampwidth()
+        rate = reader.getframerate()
+        frames = reader.readframes(reader.getnframes())
+
+    if width == 1:
+        samples = (np.frombuffer(frames, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        samples = np.frombuffer(frames, dtype="<i2").astype(np.float32) / 32768.0
+    elif width == 4:
+        samples = np.frombuffer(frames, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported sample width: {width}")
+
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    if sample_rate is not None and sample_rate != rate and len(samples):
+        target_length = int(round(len(samples) * sample_rate / rate))
+        positions = np.linspace(0, len(samples) - 1, num=target_length)
+        samples = np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+    return samples
+
+class MediaPreprocessor:
+    """
+    Shared preprocessing stage that decodes media for VisionAgent and AudioAgent.
+
+    Reads `image_path`/`image_bytes` and `audio_path`/`audio_bytes` from the
+    state, decodes each asset once through memory-mapped reads, and stores the
+    normalized read-only array under `image`/`audio`. Decoded arrays are cached
+    by content hash, so the same asset is decoded once no matter how many
+    requests or agents use it.
+
+    Design:
+    image_path ───►┌──────────────┐───► image ───► VisionAgent
+                   │ Preprocessor │
+    audio_path ───►└──────────────┘───► audio ───► AudioAgent
+    """
+
+    SOURCES: Dict[str, Tuple[str, str]] = {
+        "image": ("image_path", "image_bytes"),
+        "audio": ("audio_path", "audio_bytes"),
+    }
+    MAX_TRACKED_PATHS: int = 100000
+
+    def __init__(
+        self,
+        cache: Optional[MediaCache] = None,
+        image_size: Optional[Tuple[int, int]] = None,
+        sample_rate: Optional[int] = 16000,
+        decoders: Optional[Dict[str, Callable[[Union[mmap.mmap, memoryview]], np.ndarray]]] = None
+    ) -> None:
+        """
+        Initialize the MediaPreprocessor.
+
+        Args:
+            cache (Optional[MediaCache]): Cache of decoded arrays. Pass the same cache to several
+                preprocessors to share it. Defaults to a new 512 MiB cache.
+            image_size (Optional[Tuple[int, int]]): Target (width, height) for images. None keeps the original size.
+            sample_rate (Optional[int]): Target sample rate for audio. Default is 16000.
+            decoders (Optional[Dict[str, Callable]]): Custom decoders for "image" and/or "audio",
+                taking the encoded buffer and returning an array.
+        """
+        self.cache: MediaCache = cache or MediaCache()
+        self.image_size: Optional[Tuple[int, int]] = image_size
+        self.sample_rate: Optional[int] = sample_rate
+        self.decoders: Dict[str, Callable[[Union[mmap.mmap, memoryview]], Any]] = {
+            "image": lambda buffer: decode_image(buffer, self.image_size),
+            "audio": lambda buffer: decode_audio(buffer, self.sample_rate),
+        }
+        self.decoders.update(decoders or {})
+        self._path_hashes: Dict[Tuple[str, int, int], str] = {}
+
+    def invoke(self, state: State) -> StateDelta:
+        """
+        Decode the media referenced by the state.
+
+        Media already present in decoded form is left untouched.
+
+        Args:
+            state (State): The current state containing media paths or bytes.
+
+        Returns:
+            StateDelta: The decoded `image` and/or `audio` arrays.
+        """
+        delta = StateDelta()
+        for kind, (path_key, bytes_key) in self.SOURCES.items():
+            if state.get(kind) is not None:
+                continue
+            source = state.get(path_key)
+            if source is None:
+                source = state.get(bytes_key)
+            if source is not None:
+                delta[kind] = self.load(kind, source)
+        return delta
+
+    def load(self, kind: str, source: MediaSource) -> np.ndarray:
+        """
+        Decode a media source, reusing the cached array when the content was seen before.
+
+        Args:
+            kind (str): "image" or "audio".
+            source (MediaSource): A file path or the raw encoded bytes.
+
+        Returns:
+            np.ndarray: The normalized, read-only array.
+        """
+        # Each load performs exactly one counted cache lookup, so hit/miss statistics stay accurate.
+        path_key = self._path_key(source)
+        digest = self._path_hashes.get(path_key) if path_key else None
+        if digest is not None:
+            key = self._cache_key(kind, digest)
+            array = self.cache.get(key)
+            if array is not None:
+                return array
+
+        with open_media(source) as buffer:
+            if digest is None:
+                digest = hashlib.sha256(buffer).hexdigest()
+                if path_key:
+                    if len(self._path_hashes) >= self.MAX_TRACKED_PATHS:
+                        self._path_hashes.clear()
+                    self._path_hashes[path_key] = digest
+                key = self._cache_key(kind, digest)
+                array = self.cache.get(key)
+                if array is not None:
+                    return array
+            array = self.decoders[kind](buffer)
+
+        array = np.asarray(array)
+        if array.base is not None:
+            # Detach from the decoder's buffers, which may point into the memory map.
+            array = array.copy()
+        array.setflags(write=False)
+        self.cache.put(key, array)
+        return array
+
+    def _cache_key(self, kind: str, digest: str) -> str:
+        params = self.image_size if kind == "image" else self.sample_rate
+        return f"{kind}:{params}:{digest}"
+
+    def _path_key(self, source: MediaSource) -> Optional[Tuple[str, int, int]]:
+        # Paths are keyed by (path, mtime, size) so unchanged files skip re-hashing.
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return None
+        stat = os.stat(source)
+        return (os.fspath(source), stat.st_mtime_ns, stat.st_size)
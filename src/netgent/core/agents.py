@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from .state import State
+from typing import List, Optional, Union
+from .state import State, StateDelta
 from ..agents.llm import LLM
 from ..tools.base import Tool
 
@@ -13,11 +13,15 @@ class Agent(LLM, ABC):
         super().__init__(model_name, api_key)
         self.tools = tools or []
         self.prompt = None  # To be set by subclasses
+        self.input_keys: Optional[List[str]] = None  # State keys read by a deterministic agent; enables caching in NetworkAgent
+        self.cache_key: Optional[str] = None  # Stable identity for cached outputs; defaults to class and model name
 
     @abstractmethod
-    def invoke(self, state: State) -> State:
+    def invoke(self, state: State) -> Union[State, StateDelta]:
         """
         Process the given state and return a new state.
+        Agents may instead return a StateDelta holding only the keys they changed,
+        which the workflow applies with its per-key reducers.
         This method should be implemented by subclasses to define the agent's behavior.
         """
         pass
@@ -0,0 +1,247 @@
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from threading import Event, Semaphore, Thread
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from .states import State
+
+STATUS_KEY = "agent_status"
+
+# Longest wait between checks of a cancellation token, so cancel() takes effect promptly.
+POLL_INTERVAL = 0.05
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised when a request's deadline passes or its token is cancelled.
+    """
+
+class CancellationToken:
+    """
+    Request-scoped deadline and cancellation signal.
+
+    A token is created once per request and threaded through `invoke`. Workflows
+    check it between steps and stop waiting on outstanding agents once it
+    expires; agents can read `remaining()` to bound their own model calls.
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        parent: Optional["CancellationToken"] = None,
+        limiter: Optional[Semaphore] = None
+    ) -> None:
+        """
+        Initialize a CancellationToken.
+
+        Args:
+            timeout (Optional[float]): Seconds from now until the deadline. None means no deadline.
+            parent (Optional[CancellationToken]): A token whose deadline and cancellation this token inherits.
+            limiter (Optional[Semaphore]): Bounds the number of calls running detached under tokens
+                sharing it, including calls abandoned at their deadline. Inherited from `parent` if unset.
+        """
+        self.deadline: Optional[float] = time.monotonic() + timeout if timeout is not None else None
+        self.parent: Optional[CancellationToken] = parent
+        self.limiter: Optional[Semaphore] = limiter if limiter is not None or parent is None else parent.limiter
+        if parent is not None and parent.deadline is not None:
+            if self.deadline is None or parent.deadline < self.deadline:
+                self.deadline = parent.deadline
+        self._event = Event()
+
+    def cancel(self) -> None:
+        """
+        Cancel the token. Workflows observing it stop as soon as possible.
+        """
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the token was cancelled or its deadline has passed."""
+        if self._event.is_set():
+            return True
+        if self.parent is not None and self.parent.cancelled:
+            return True
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def remaining(self) -> Optional[float]:
+        """
+        Get the number of seconds left until the deadline.
+
+        Returns:
+            Optional[float]: Seconds left (0.0 once cancelled or expired), or None if there is no deadline.
+        """
+        if self.cancelled:
+            return 0.0
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def check(self) -> None:
+        """
+        Raise if the token was cancelled or its deadline has passed.
+
+        Raises:
+            DeadlineExceeded: If the token is no longer active.
+        """
+        if self.cancelled:
+            raise DeadlineExceeded("Request deadline exceeded or cancelled.")
+
+    def wait_timeout(self, timeout: Optional[float] = None) -> float:
+        """
+        Cap a wait timeout so a waiter notices expiry or `cancel()` promptly.
+
+        Args:
+            timeout (Optional[float]): The timeout the waiter would otherwise use. None means no limit.
+
+        Returns:
+            float: The shortest of `timeout`, the time left and `POLL_INTERVAL`.
+        """
+        remaining = self.remaining()
+        capped = POLL_INTERVAL if remaining is None else min(POLL_INTERVAL, remaining)
+        return capped if timeout is None else min(capped, timeout)
+
+_current_token: ContextVar[Optional[CancellationToken]] = ContextVar("netgent_cancellation_token", default=None)
+
+def current_token() -> Optional[CancellationToken]:
+    """
+    Get the cancellation token of the request currently being processed.
+
+    Agents call this to bound their own work (e.g. a model call timeout)
+    without having their `invoke` signature changed.
+
+    Returns:
+        Optional[CancellationToken]: The active token, or None outside a deadline-bound request.
+    """
+    return _current_token.get()
+
+@contextmanager
+def use_token(token: Optional[CancellationToken]) -> Iterator[None]:
+    """
+    Make `token` the current token for the duration of the block.
+
+    Args:
+        token (Optional[CancellationToken]): The token to activate. None leaves the current token untouched.
+    """
+    if token is None:
+        yield
+        return
+    reset = _current_token.set(token)
+    try:
+        yield
+    finally:
+        _current_token.reset(reset)
+
+def start_with_token(fn: Callable[..., Any], token: Optional[CancellationToken], *args: Any) -> Future:
+    """
+    Start `fn(*args)` on a daemon thread with `token` active.
+
+    The call runs in a copy of the caller's context, so context variables
+    such as the current token are visible to it. Daemon threads do not block
+    interpreter exit if the call hangs after it was abandoned. If the token
+    has a limiter, a slot is held until the call actually finishes, so
+    abandoned calls cannot pile up without bound.
+
+    Args:
+        fn (Callable[..., Any]): The function to call, typically an agent's `invoke`.
+        token (Optional[CancellationToken]): The request token.
+        *args (Any): Positional arguments for `fn`.
+
+    Returns:
+        Future: Resolves to the return value of `fn`.
+
+    Raises:
+        DeadlineExceeded: If the token expires before a limiter slot frees up.
+    """
+    limiter = token.limiter if token is not None else None
+    if limiter is not None and not limiter.acquire(timeout=token.remaining()):
+        raise DeadlineExceeded("Request deadline exceeded while waiting for a free worker.")
+
+    future: Future = Future()
+    context = copy_context()
+
+    def target() -> None:
+        try:
+            with use_token(token):
+                future.set_result(fn(*args))
+        except BaseException as error:
+            future.set_exception(error)
+        finally:
+            if limiter is not None:
+                limiter.release()
+
+    Thread(target=context.run, args=(target,), daemon=True).start()
+    return future
+
+def run_with_token(fn: Callable[..., Any], token: Optional[CancellationToken], *args: Any) -> Any:
+    """
+    Call `fn(*args)` with `token` active, giving up once the token expires.
+
+    Without a deadline the call runs inline. With a deadline it runs through
+    `start_with_token`, so a hung call no longer holds the caller past the deadline.
+
+    Args:
+        fn (Callable[..., Any]): The function to call, typically an agent's `invoke`.
+        token (Optional[CancellationToken]): The request token.
+        *args (Any): Positional arguments for `fn`.
+
+    Returns:
+        Any: The return value of `fn`.
+
+    Raises:
+        DeadlineExceeded: If the token expires before `fn` returns, or before a limiter slot frees up.
+    """
+    if token is None:
+        return fn(*args)
+    token.check()
+    if token.deadline is None:
+        with use_token(token):
+            return fn(*args)
+
+    future = start_with_token(fn, token, *args)
+    try:
+        return future.result(timeout=token.remaining())
+    except FutureTimeoutError:
+        raise DeadlineExceeded("Request deadline exceeded or cancelled.") from None
+
+def invoke_agent(agent: Any, state: State, token: Optional[CancellationToken]) -> State:
+    """
+    Invoke an agent under `token`.
+
+    When the call may be abandoned at the deadline, the agent works on a
+    shallow copy, so a late-finishing agent cannot mutate the state the
+    workflow has already returned.
+
+    Args:
+        agent (Any): The agent to invoke.
+        state (State): The input state.
+        token (Optional[CancellationToken]): The request token.
+
+    Returns:
+        State: The agent's output state.
+
+    Raises:
+        DeadlineExceeded: If the token expires before the agent returns.
+    """
+    if token is not None and token.deadline is not None:
+        state = state.copy()
+    return run_with_token(agent.invoke, token, state)
+
+def agent_name(agent: Any) -> str:
+    """Get a readable name for an agent, used in status reports."""
+    return getattr(agent, "model_name", type(agent).__name__)
+
+def agent_statuses(agents: List[Any], statuses: List[str]) -> List[Dict[str, str]]:
+    """
+    Build the per-agent status report stored under `STATUS_KEY`.
+
+    Statuses are "completed", "timed_out" (running when the deadline passed)
+    or "cancelled" (never started, or no longer needed).
+
+    Args:
+        agents (List[Any]): The agents of the workflow, in order.
+        statuses (List[str]): The status of each agent, in the same order.
+
+    Returns:
+        List[Dict[str, str]]: One entry per agent with its name and status.
+    """
+    return [{"agent": agent_name(agent), "status": status} for agent, status in zip(agents, statuses)]
@@ -0,0 +1,118 @@
+import hashlib
+import pickle
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple, Union
+from .states import State
+
+def fingerprint(state: State, keys: Sequence[str]) -> Optional[str]:
+    """
+    Fingerprint the slice of a state an agent reads.
+
+    Args:
+        state (State): The state the agent is about to be invoked with.
+        keys (Sequence[str]): The keys the agent reads.
+
+    Returns:
+        Optional[str]: A hex digest of the keys and their values, or None if a value cannot be serialized.
+    """
+    digest = hashlib.sha256()
+    for key in keys:
+        _update(digest, b"k", key.encode("utf-8"))
+        if key not in state.data:
+            _update(digest, b"m", b"")
+            continue
+        value = state.data[key]
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            _update(digest, b"b", value)
+            continue
+        try:
+            _update(digest, b"p", pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            return None
+    return digest.hexdigest()
+
+def _update(digest: Any, tag: bytes, payload: Union[bytes, bytearray, memoryview]) -> None:
+    # Every field is tagged with its type and prefixed with its length, so distinct slices never
+    # serialize to the same byte stream.
+    digest.update(tag + memoryview(payload).nbytes.to_bytes(8, "big"))
+    digest.update(payload)
+
+class ExecutionCache:
+    """
+    LRU cache of agent outputs keyed by the fingerprint of their inputs.
+
+    Used by NetworkAgent to skip deterministic agents whose input slice is
+    unchanged since a previous run, like an incremental build. Cached outputs
+    are shared between runs and must not be mutated in place.
+
+    An entry records the keys an agent wrote and the keys it deleted. Values
+    an agent mutates in place without reassigning their key are not
+    recorded, so such agents should return a StateDelta or not declare
+    `input_keys`.
+    """
+
+    def __init__(self, max_entries: int = 10000) -> None:
+        """
+        Initialize the ExecutionCache.
+
+        Args:
+            max_entries (int): Maximum number of cached agent outputs. Default is 10000.
+        """
+        self.max_entries: int = max_entries
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: "OrderedDict[Hashable, Tuple[Dict[str, Any], bool, Tuple[str, ...]]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[Tuple[Dict[str, Any], bool, Tuple[str, ...]]]:
+        """
+        Get the cached output of a step.
+
+        Args:
+            key (Hashable): The step key.
+
+        Returns:
+            Optional[Tuple[Dict[str, Any], bool, Tuple[str, ...]]]: The cached output, whether the agent
+                returned it as a StateDelta, and the keys it deleted, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: Hashable, delta: Dict[str, Any], is_delta: bool, deleted: Tuple[str, ...] = ()) -> None:
+        """
+        Cache the output of a step, evicting the least recently used entry when full.
+
+        Args:
+            key (Hashable): The step key.
+            delta (Dict[str, Any]): The keys the agent changed and their values.
+            is_delta (bool): Whether the agent returned a StateDelta, to be applied with the reducers,
+                rather than a whole State holding final values.
+            deleted (Tuple[str, ...]): The keys a whole-State agent removed from the state. Default is ().
+        """
+        with self._lock:
+            self._entries[key] = (delta, is_delta, deleted)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached outputs."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict[str, int]: Entry count, hits and misses.
+        """
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,261 @@
+import os
+import pickle
+import sys
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+from .states import State
+
+def sizeof(value: Any, seen: Optional[Set[int]] = None) -> int:
+    """
+    Estimate the number of bytes held by a value, including nested containers.
+
+    Arrays and tensors are measured by their `nbytes`; shared objects are
+    counted once.
+
+    Args:
+        value (Any): The value to measure.
+        seen (Optional[Set[int]]): Ids of objects already counted.
+
+    Returns:
+        int: The estimated size in bytes.
+    """
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        # numpy already counts the buffer of arrays that own their data; views and tensors only report a header.
+        if getattr(getattr(value, "flags", None), "owndata", False):
+            return sys.getsizeof(value)
+        return sys.getsizeof(value, 0) + nbytes
+    size = sys.getsizeof(value, 0)
+    if isinstance(value, State):
+        return size + sizeof(value.data, seen)
+    if isinstance(value, dict):
+        return size + sum(sizeof(key, seen) + sizeof(item, seen) for key, item in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(sizeof(item, seen) for item in value)
+    return size
+
+def state_sizes(state: State) -> Dict[str, int]:
+    """
+    Report the size in bytes of each key of a state.
+
+    Args:
+        state (State): The state to measure.
+
+    Returns:
+        Dict[str, int]: The size of each value, keyed by state key.
+    """
+    return {key: sizeof(value) for key, value in state.data.items()}
+
+class SpilledValue:
+    """
+    Placeholder for a state value that was moved to disk by a MemoryMonitor.
+    """
+
+    def __init__(self, path: str, size: int) -> None:
+        """
+        Initialize a SpilledValue.
+
+        Args:
+            path (str): The file holding the pickled value.
+            size (int): The in-memory size of the value when it was spilled.
+        """
+        self.path: str = path
+        self.size: int = size
+
+    def load(self) -> Any:
+        """
+        Load the value back from disk.
+
+        Returns:
+            Any: The original value.
+        """
+        with open(self.path, "rb") as file:
+            return pickle.load(file)
+
+    def delete(self) -> None:
+        """
+        Delete the spilled file. The value cannot be loaded afterwards.
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __repr__(self) -> str:
+        return f"SpilledValue(path={self.path!r}, size={self.size})"
+
+class MemoryMonitor:
+    """
+    Tracks per-step peak memory and per-key state sizes, and enforces state-size limits.
+
+    Pass a monitor to `sequential()` or `NetworkAgent` to measure the peak
+    memory allocated during each agent step and keep the state within the
+    configured limits. Oversized values are spilled to `spill_dir` and
+    replaced with a SpilledValue, or evicted from the state when no spill
+    directory is configured. Call `close()` when done to stop peak tracking
+    and delete the spilled files.
+    """
+
+    def __init__(
+        self,
+        max_value_bytes: Optional[int] = None,
+        max_total_bytes: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+        protected_keys: Iterable[str] = (),
+        track_peak: bool = False
+    ) -> None:
+        """
+        Initialize the MemoryMonitor.
+
+        Args:
+            max_value_bytes (Optional[int]): Maximum size of a single state value. None disables the limit.
+            max_total_bytes (Optional[int]): Maximum total size of the unprotected values of a state.
+                Largest values are spilled or evicted first. None disables the limit.
+            spill_dir (Optional[str]): Directory for spilled values. If None, oversized values are evicted.
+            protected_keys (Iterable[str]): Keys that are never spilled or evicted.
+            track_peak (bool): Whether to track peak memory per step with tracemalloc. Tracing slows
+                down every allocation in the process until `close()` is called. Default is False.
+        """
+        self.max_value_bytes: Optional[int] = max_value_bytes
+        self.max_total_bytes: Optional[int] = max_total_bytes
+        self.spill_dir: Optional[str] = spill_dir
+        self.protected_keys: Set[str] = set(protected_keys)
+        self.track_peak: bool = track_peak
+        self.steps: Dict[str, Dict[str, int]] = {}
+        self.last_sizes: Dict[str, int] = {}
+        self.spilled: int = 0
+        self.evicted: Dict[str, int] = {}
+        self._spilled_values: List[SpilledValue] = []
+        self._lock = Lock()
+        self._started_tracing: bool = False
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+        if track_peak and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def close(self) -> None:
+        """
+        Stop peak tracking, if this monitor started it, and delete the spilled files.
+        """
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self.track_peak = False
+        self.cleanup()
+
+    def cleanup(self) -> None:
+        """
+        Delete every file spilled by this monitor. Spilled values can no longer be loaded afterwards.
+        """
+        with self._lock:
+            spilled_values, self._spilled_values = self._spilled_values, []
+        for spilled_value in spilled_values:
+            spilled_value.delete()
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """
+        Measure the peak memory allocated while the block runs.
+
+        Peaks of nested or concurrent steps share tracemalloc's single peak
+        counter, so they are approximate.
+
+        Args:
+            name (str): The name of the step, usually the agent's name.
+        """
+        if not self.track_peak or not tracemalloc.is_tracing():
+            yield
+            return
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            self._record_step(name, max(0, peak - start))
+
+    def _record_step(self, name: str, peak: int) -> None:
+        with self._lock:
+            step = self.steps.setdefault(name, {"calls": 0, "peak_bytes": 0, "last_peak_bytes": 0})
+            step["calls"] += 1
+            step["last_peak_bytes"] = peak
+            step["peak_bytes"] = max(step["peak_bytes"], peak)
+
+    def enforce(self, state: State) -> State:
+        """
+        Record the per-key sizes of a state and apply the configured limits in place.
+
+        Args:
+            state (State): The state to check.
+
+        Returns:
+            State: The same state, with oversized values spilled or evicted.
+        """
+        sizes = state_sizes(state)
+        candidates = sorted(
+            (key for key in sizes if key not in self.protected_keys and not isinstance(state.data[key], SpilledValue)),
+            key=lambda key: sizes[key],
+            reverse=True
+        )
+        # Protected keys are not counted against the total budget, since they can never be released.
+        total = sum(size for key, size in sizes.items() if key not in self.protected_keys)
+        for key in candidates:
+            over_value = self.max_value_bytes is not None and sizes[key] > self.max_value_bytes
+            over_total = self.max_total_bytes is not None and total > self.max_total_bytes
+            if not over_value and not over_total:
+                continue
+            total -= sizes[key]
+            if self._release(state, key, sizes[key]):
+                sizes[key] = sizeof(state.data[key])
+                total += sizes[key]
+            else:
+                del sizes[key]
+
+        with self._lock:
+            self.last_sizes = sizes
+        return state
+
+    def _release(self, state: State, key: str, size: int) -> bool:
+        # Spills the value to disk when possible, evicts it otherwise; returns whether it was spilled.
+        if self.spill_dir is not None:
+            path = os.path.join(self.spill_dir, f"{uuid.uuid4().hex}.pkl")
+            try:
+                with open(path, "wb") as file:
+                    pickle.dump(state.data[key], file, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                if os.path.exists(path):
+                    os.remove(path)
+            else:
+                state.data[key] = SpilledValue(path, size)
+                with self._lock:
+                    self.spilled += 1
+                    self._spilled_values.append(state.data[key])
+                return True
+        state.delete(key)
+        with self._lock:
+            self.evicted[key] = self.evicted.get(key, 0) + 1
+        return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get a snapshot of the memory statistics.
+
+        Returns:
+            Dict[str, Any]: Per-step peaks, the per-key sizes of the last checked state,
+                the number of spilled values and the eviction count per key.
+        """
+        with self._lock:
+            return {
+                "steps": {name: dict(step) for name, step in self.steps.items()},
+                "state_bytes": dict(self.last_sizes),
+                "total_state_bytes": sum(self.last_sizes.values()),
+                "spilled": self.spilled,
+                "evicted": dict(self.evicted),
+            }
@@ -1,29 +1,57 @@
-from typing import List, Optional
+from contextlib import nullcontext
+from typing import Dict, List, Optional, Tuple
 from .agent import Agent
-from .state import State
+from .state import State, StateDelta
+from .cancellation import CancellationToken, DeadlineExceeded, STATUS_KEY, agent_name, agent_statuses, invoke_agent
+from .incremental import ExecutionCache, fingerprint
+from .memory import MemoryMonitor
+from .reducers import Reducer, apply_delta, apply_result, changed_keys
 
 class NetworkAgent:
     """
     Parent class for creating networks of agents in NetGent.
     """
 
-    def __init__(self, agents: List[Agent], initial_state: Optional[State] = None):
+    def __init__(
+        self,
+        agents: List[Agent],
+        initial_state: Optional[State] = None,
+        reducers: Optional[Dict[str, Reducer]] = None,
+        cache: Optional[ExecutionCache] = None,
+        monitor: Optional[MemoryMonitor] = None
+    ):
         """
         Initialize a NetworkAgent.
 
         Args:
             agents (List[Agent]): List of agents in the network.
             initial_state (Optional[State]): Initial state for the network. Defaults to None.
+            reducers (Optional[Dict[str, Reducer]]): Reducer per key used to apply StateDelta
+                results returned by agents. Keys without a reducer are replaced. Defaults to None.
+            cache (Optional[ExecutionCache]): Cache of agent outputs. When set, agents that declare
+                `input_keys` are skipped and their previous output reused whenever their input slice
+                of the state is unchanged. Since downstream inputs are then unchanged as well, only
+                agents whose inputs actually changed are re-run. Cached outputs are keyed by the
+                agent's position and its `cache_key`, or its class and model name when unset. Agents returning
+                a whole State must reassign the keys they change rather than mutate values in place. Defaults to None.
+            monitor (Optional[MemoryMonitor]): Records the peak memory of each agent step and the
+                per-key state sizes, and enforces its state-size limits after every step. Defaults to None.
         """
         self.agents: List[Agent] = agents
         self.initial_state: Optional[State] = initial_state
+        self.reducers: Dict[str, Reducer] = reducers or {}
+        self.cache: Optional[ExecutionCache] = cache
+        self.monitor: Optional[MemoryMonitor] = monitor
 
-    def invoke(self, state: Optional[State] = None) -> State:
+    def invoke(self, state: Optional[State] = None, token: Optional[CancellationToken] = None) -> State:
         """
         Process the given state through the network of agents.
 
         Args:
             state (Optional[State]): Input state. If None, uses the initial_state.
+            token (Optional[CancellationToken]): Request deadline/cancellation token. When it expires,
+                the remaining agents are skipped and the partial state is returned with a per-agent
+                status report under "agent_status". Default is None.
 
         Returns:
             State: The final state after processing through all agents.
@@ -35,11 +63,74 @@ class NetworkAgent:
         if current_state is None:
             raise ValueError("No state provided and initial_state is None.")
 
-        for agent in self.agents:
-            current_state = agent.invoke(current_state)
+        statuses: List[str] = ["cancelled"] * len(self.agents)
+        for index, agent in enumerate(self.agents):
+            if token is not None and token.cancelled:
+                break
+            try:
+                with self.monitor.step(agent_name(agent)) if self.monitor is not None else nullcontext():
+                    current_state = self._run_step(index, agent, current_state, token)
+            except DeadlineExceeded:
+                statuses[index] = "timed_out"
+                break
+            statuses[index] = "completed"
+            if self.monitor is not None:
+                self.monitor.enforce(current_state)
 
+        if token is not None:
+            current_state.update({STATUS_KEY: agent_statuses(self.agents, statuses)})
         return current_state
 
+    def _input_keys(self, agent: Agent) -> Optional[Tuple[str, ...]]:
+        input_keys = getattr(agent, "input_keys", None)
+        if self.cache is None or input_keys is None:
+            return None
+        return tuple(sorted(input_keys))
+
+    def _cache_id(self, agent: Agent) -> str:
+        # A stable identity for the agent: object ids may be reused once an agent is freed,
+        # which would let a shared cache return another agent's output.
+        cache_key = getattr(agent, "cache_key", None)
+        if cache_key is not None:
+            return cache_key
+        agent_type = type(agent)
+        return f"{agent_type.__module__}.{agent_type.__qualname__}:{agent_name(agent)}"
+
+    def _run_step(
+        self,
+        index: int,
+        agent: Agent,
+        state: State,
+        token: Optional[CancellationToken]
+    ) -> State:
+        input_keys = self._input_keys(agent)
+        if input_keys is None:
+            return apply_result(state, invoke_agent(agent, state, token), self.reducers)
+
+        digest = fingerprint(state, input_keys)
+        key = (index, self._cache_id(agent), digest)
+        if digest is not None:
+            entry = self.cache.get(key)
+            if entry is not None:
+                delta, is_delta, deleted = entry
+                if is_delta:
+                    return apply_delta(state, delta, self.reducers)
+                # Whole-State outputs hold final values, which must not go through the reducers again.
+                state.update(delta)
+                for deleted_key in deleted:
+                    state.delete(deleted_key)
+                return state
+
+        base = dict(state.data)
+        result = invoke_agent(agent, state, token)
+        if digest is not None:
+            if isinstance(result, StateDelta):
+                self.cache.put(key, dict(result), True)
+            else:
+                deleted = tuple(name for name in base if name not in result.data)
+                self.cache.put(key, changed_keys(base, result), False, deleted)
+        return apply_result(state, result, self.reducers)
+
     def add_agent(self, agent: Agent) -> None:
         """
         Add an agent to the network.
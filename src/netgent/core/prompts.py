@@ -1,6 +1,7 @@
 from typing import List, Optional, Callable
 from ..state import State
 from ..agent import Agent
+from .reducers import apply_result
 
 def chain_of_thought_prompt(agent: Agent, state: State) -> State:
     """
@@ -31,13 +32,14 @@ def chain_of_thought_prompt(agent: Agent, state: State) -> State:
 
     updated_state = state.copy()
     updated_state.update({"prompt": prompt.format(state=state.data)})
-    return agent.invoke(updated_state)
+    return apply_result(updated_state, agent.invoke(updated_state))
 
 def average_result_prompt(
     agent: Agent,
     state: State,
     k: int = 3,
-    evaluator_agent: Optional[Agent] = None
+    evaluator_agent: Optional[Agent] = None,
+    result_key: str = "text_result"
 ) -> State:
     """
     Invoke an agent K times, concatenate responses, and extract the best answer.
@@ -47,16 +49,18 @@ def average_result_prompt(
         state (State): The initial state.
         k (int): Number of times to invoke the agent. Default is 3.
         evaluator_agent (Optional[Agent]): An optional agent to evaluate the final result.
+        result_key (str): The state key holding each response. Default is "text_result".
 
     Returns:
         State: The final state with the best answer.
     """
-    results: List[State] = []
+    # Keep only the response of each run; the rest of the state is the same input every time.
+    responses: List[str] = []
     
     for _ in range(k):
-        results.append(agent.invoke(state))
+        responses.append(str(apply_result(state, agent.invoke(state)).get(result_key)))
     
-    concatenated_results = "\n\n".join([str(result.data) for result in results])
+    concatenated_results = "\n\n".join(responses)
     
     prompt = f"""
     You have been given {k} different responses to the same query. Your task is to:
@@ -74,7 +78,7 @@ def average_result_prompt(
 
     updated_state = state.copy()
     updated_state.update({"prompt": prompt})
-    best_answer = agent.invoke(updated_state)
+    best_answer = apply_result(updated_state, agent.invoke(updated_state))
 
     if evaluator_agent:
         evaluation_prompt = f"""
@@ -86,7 +90,7 @@ def average_result_prompt(
         """
         evaluation_state = state.copy()
         evaluation_state.update({"prompt": evaluation_prompt})
-        evaluation = evaluator_agent.invoke(evaluation_state)
+        evaluation = apply_result(evaluation_state, evaluator_agent.invoke(evaluation_state))
         
         best_answer.update({"evaluation": evaluation.data})
 
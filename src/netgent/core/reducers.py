@@ -0,0 +1,93 @@
+from typing import Any, Callable, Dict, Mapping, Optional, Union
+from .states import State, StateDelta
+
+# Combines the current value of a key with an update: reducer(current, update) -> value.
+# `current` is None when the key is not yet set in the state.
+Reducer = Callable[[Any, Any], Any]
+
+def replace(current: Any, update: Any) -> Any:
+    """Overwrite the current value. This is the default reducer."""
+    return update
+
+def append(current: Any, update: Any) -> Any:
+    """Append the update (a single item or a list of items) to the current list."""
+    items = update if isinstance(update, list) else [update]
+    if current is None:
+        return list(items)
+    return [*current, *items]
+
+def maximum(current: Any, update: Any) -> Any:
+    """Keep the largest value."""
+    if current is None:
+        return update
+    return max(current, update)
+
+def minimum(current: Any, update: Any) -> Any:
+    """Keep the smallest value."""
+    if current is None:
+        return update
+    return min(current, update)
+
+def merge(current: Any, update: Any) -> Any:
+    """Merge the update dictionary into the current dictionary."""
+    if current is None:
+        return dict(update)
+    return {**current, **update}
+
+def apply_delta(state: State, delta: Mapping[str, Any], reducers: Optional[Dict[str, Reducer]] = None) -> State:
+    """
+    Apply a delta to a state in place, key by key.
+
+    Args:
+        state (State): The state to update.
+        delta (Mapping[str, Any]): The changed keys and their new values.
+        reducers (Optional[Dict[str, Reducer]]): Reducer per key. Keys without one are replaced.
+
+    Returns:
+        State: The updated state.
+    """
+    reducers = reducers or {}
+    for key, value in delta.items():
+        reducer = reducers.get(key, replace)
+        state.data[key] = reducer(state.data.get(key), value)
+    return state
+
+def apply_result(
+    state: State,
+    result: Union[State, StateDelta],
+    reducers: Optional[Dict[str, Reducer]] = None
+) -> State:
+    """
+    Fold an agent's result into the running state.
+
+    Agents may return either a whole State, which becomes the new running
+    state as before, or a StateDelta, which is applied to `state` with
+    `reducers`.
+
+    Args:
+        state (State): The state the agent was invoked with.
+        result (Union[State, StateDelta]): The agent's return value.
+        reducers (Optional[Dict[str, Reducer]]): Reducer per key for deltas.
+
+    Returns:
+        State: The running state after the agent's step.
+    """
+    if isinstance(result, StateDelta):
+        return apply_delta(state, result, reducers)
+    return result
+
+def changed_keys(base: Mapping[str, Any], result: State) -> Dict[str, Any]:
+    """
+    Extract the keys of a whole-State result that differ from `base`.
+
+    Values are compared by identity, so unchanged values are skipped
+    without being inspected.
+
+    Args:
+        base (Mapping[str, Any]): The state data the agent started from.
+        result (State): The state the agent returned.
+
+    Returns:
+        Dict[str, Any]: The keys whose values were added or replaced.
+    """
+    return {key: value for key, value in result.data.items() if key not in base or base[key] is not value}
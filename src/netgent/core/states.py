@@ -31,4 +31,17 @@ class State(BaseStore):
 
     def update(self, new_data: Dict[str, Any]) -> None:
         """Update the state with new data."""
-        self.data.update(new_data)
\ No newline at end of file
+        self.data.update(new_data)
+
+    def copy(self) -> "State":
+        """Return a shallow copy of the state."""
+        return State(dict(self.data))
+
+class StateDelta(dict):
+    """
+    Partial update returned by an agent instead of a whole State.
+
+    Holds only the keys the agent changed. Workflows apply it to the running
+    state with per-key reducers, so handoff cost scales with the change
+    rather than with the state.
+    """
@@ -0,0 +1,140 @@
+import inspect
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import BoundedSemaphore
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+from ..core.agent import Agent
+from ..core.state import State
+from ..core.cancellation import CancellationToken, STATUS_KEY, invoke_agent
+from ..core.reducers import apply_result
+
+def batch(
+    network: Agent,
+    input_path: str,
+    output_path: str,
+    concurrency: int = 4,
+    resume: bool = True,
+    timeout: Optional[float] = None,
+    report_every: int = 100,
+    on_progress: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Run every record of a JSONL dataset through an agent or network and write the results to JSONL.
+
+    This function implements the offline batch workflow pattern. Records are
+    streamed from the input file, processed with bounded concurrency and
+    written to the output file in input order as soon as they finish, so
+    memory use does not grow with the dataset.
+
+    Design:
+    input.jsonl ───► ┌─► Network ─┐
+                     ├─► Network ─┼───► output.jsonl
+                     └─► Network ─┘
+                      (concurrency)
+
+    Each output line is `{"index": i, "status": "ok", "state": {...}}`,
+    `{"index": i, "status": "timed_out", "state": {...}}` with the partial
+    state and its "agent_status" report, or `{"index": i, "status": "error",
+    "error": "..."}`, where `i` is the position of the record among the
+    non-blank input lines.
+
+    Args:
+        network (Agent): The agent or NetworkAgent to invoke on each record.
+        input_path (str): Path to the input JSONL file. Each line holds the initial state of one record.
+        output_path (str): Path to the output JSONL file.
+        concurrency (int): Maximum number of records processed at once. Default is 4.
+        resume (bool): If True, skip records already present in the output file and append to it.
+            If False, overwrite the output file. Default is True.
+        timeout (Optional[float]): Per-record deadline in seconds. Networks whose `invoke` accepts a
+            `token` receive it directly; other agents are abandoned at the deadline. At most
+            `concurrency` calls may be abandoned and still running at once. Default is None.
+        report_every (int): Call `on_progress` every this many records. Default is 100.
+        on_progress (Optional[Callable[[Dict[str, Any]], None]]): Receives throughput and error-rate
+            statistics while the batch runs and once at the end.
+
+    Returns:
+        Dict[str, Any]: The final statistics.
+
+    Example:
+        stats = batch(network, "records.jsonl", "results.jsonl", concurrency=8, on_progress=print)
+    """
+    skipped = _completed_records(output_path) if resume else 0
+    stats: Dict[str, Any] = {"skipped": skipped, "processed": 0, "succeeded": 0, "failed": 0}
+    started = time.monotonic()
+    limiter = BoundedSemaphore(concurrency)
+    accepts_token = "token" in inspect.signature(network.invoke).parameters
+
+    def process(line: str) -> Dict[str, Any]:
+        try:
+            record = json.loads(line)
+            state = State(record if isinstance(record, dict) else {"input": record})
+            token = CancellationToken(timeout, limiter=limiter) if timeout is not None else None
+            if accepts_token:
+                result = apply_result(state, network.invoke(state, token=token))
+            else:
+                result = apply_result(state, invoke_agent(network, state, token))
+            partial = any(entry["status"] != "completed" for entry in result.get(STATUS_KEY) or [])
+            return {"status": "timed_out" if partial else "ok", "state": result.data}
+        except Exception as error:
+            return {"status": "error", "error": f"{type(error).__name__}: {error}"}
+
+    def report() -> Dict[str, Any]:
+        elapsed = time.monotonic() - started
+        stats["elapsed"] = elapsed
+        stats["throughput"] = stats["processed"] / elapsed if elapsed else 0.0
+        stats["error_rate"] = stats["failed"] / stats["processed"] if stats["processed"] else 0.0
+        if on_progress is not None:
+            on_progress(dict(stats))
+        return stats
+
+    pending: Deque[Tuple[int, Future]] = deque()
+    with open(output_path, "a" if resume else "w", encoding="utf-8") as output, \
+            ThreadPoolExecutor(max_workers=concurrency) as executor:
+
+        def write_next() -> None:
+            index, future = pending.popleft()
+            outcome = future.result()
+            output.write(json.dumps({"index": index, **outcome}, default=str) + "\n")
+            output.flush()
+            stats["processed"] += 1
+            stats["succeeded" if outcome["status"] == "ok" else "failed"] += 1
+            if report_every and stats["processed"] % report_every == 0:
+                report()
+
+        for index, line in _records(input_path, skipped):
+            pending.append((index, executor.submit(process, line)))
+            if len(pending) >= concurrency:
+                write_next()
+        while pending:
+            write_next()
+
+    return report()
+
+def _records(input_path: str, skip: int) -> Iterator[Tuple[int, str]]:
+    # Streams the non-blank lines of the input file, numbered from 0.
+    index = 0
+    with open(input_path, "r", encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            if index >= skip:
+                yield index, line
+            index += 1
+
+def _completed_records(output_path: str) -> int:
+    # Counts the complete lines of a previous run, dropping a partially written last line.
+    if not os.path.exists(output_path):
+        return 0
+    count = 0
+    end = 0
+    with open(output_path, "rb+") as file:
+        for line in file:
+            if not line.endswith(b"\n"):
+                break
+            count += 1
+            end += len(line)
+        file.truncate(end)
+    return count
@@ -1,9 +1,18 @@
-from typing import List, Union
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Union
+from concurrent.futures import FIRST_COMPLETED, Future, wait
 from ..core.agent import Agent
-from ..core.state import State
+from ..core.state import State, StateDelta
+from ..core.cancellation import CancellationToken, DeadlineExceeded, STATUS_KEY, agent_statuses, start_with_token
+from ..core.reducers import Reducer, apply_delta, changed_keys
 
-def parallel(agents: List[Agent], initial_state: State, aggregated: bool = False) -> Union[List[State], State]:
+def parallel(
+    agents: List[Agent],
+    initial_state: State,
+    aggregated: bool = False,
+    token: Optional[CancellationToken] = None,
+    first_n: Optional[int] = None,
+    reducers: Optional[Dict[str, Reducer]] = None
+) -> Union[List[State], State]:
     """
     Run agents in parallel and return a list of resulting states or an aggregated state.
 
@@ -22,29 +31,95 @@ def parallel(agents: List[Agent], initial_state: State, aggregated: bool = False
         agents (List[Agent]): A list of Agent objects to be executed in parallel.
         initial_state (State): The initial state to be passed to all agents.
         aggregated (bool): If True, concatenate all final states into a single state. Default is False.
+        token (Optional[CancellationToken]): Request deadline/cancellation token. When it expires,
+            outstanding agents are cancelled and only the completed results are returned. Default is None.
+        first_n (Optional[int]): Return as soon as this many agents have completed and cancel the rest.
+            Default is None (wait for all agents).
+        reducers (Optional[Dict[str, Reducer]]): Reducer per key used to apply StateDelta results.
+            Keys without a reducer are replaced. Default is None.
 
     Returns:
-        Union[List[State], State]: A list of final states (if aggregated is False) or a single aggregated state (if aggregated is True).
+        Union[List[State], State]: A list of final states in agent order (if aggregated is False) or a single
+            aggregated state (if aggregated is True). When `token` or `first_n` is given, only completed agents
+            contribute, and the aggregated state, or each state of the list, carries a per-agent status report
+            under "agent_status".
 
     Example:
         results = parallel([agent1, agent2, agent3], initial_state)
         aggregated_result = parallel([agent1, agent2, agent3], initial_state, aggregated=True)
+        fastest = parallel([agent1, agent2, agent3], initial_state, aggregated=True, first_n=1)
 
     Note:
-        This function evaluates all agents simultaneously and waits for all
-        executions to finish before returning the results.
+        Each agent receives its own shallow copy of the initial state and may
+        return a StateDelta with only the keys it changed. When aggregating,
+        each agent's changes are folded into the initial state in agent order,
+        so conflicting writes resolve deterministically regardless of
+        completion order. Deltas are applied through `reducers`; the keys of
+        a returned State whose values differ from the initial state already
+        hold final values and are replaced.
+
+        Without `token` or `first_n`, this function evaluates all agents
+        simultaneously and waits for all executions to finish before
+        returning the results.
     """
-    def invoke_agent(agent: Agent) -> State:
-        return agent.invoke(initial_state)
+    # Each agent works on its own shallow copy, so its result holds only its own writes
+    # and agents abandoned after we return cannot write to the caller's state.
+    # Agents run on daemon threads holding a slot of the token's limiter until they finish,
+    # so abandoned agents neither pile up without bound nor block interpreter exit.
+    base: Dict[str, Any] = initial_state.data
+    statuses: List[str] = ["cancelled"] * len(agents)
+    results: Dict[int, Union[State, StateDelta]] = {}
+    futures: Dict[Future, int] = {}
+    timed_out = False
+
+    try:
+        for index, agent in enumerate(agents):
+            futures[start_with_token(agent.invoke, token, initial_state.copy())] = index
+    except DeadlineExceeded:
+        timed_out = True
+
+    pending = set(futures)
+    while pending and not timed_out:
+        if token is not None and token.cancelled:
+            timed_out = True
+            break
+        timeout = token.wait_timeout() if token is not None else None
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in sorted(done, key=lambda f: futures[f]):
+            try:
+                results[futures[future]] = future.result()
+            except DeadlineExceeded:
+                statuses[futures[future]] = "timed_out"
+                continue
+            statuses[futures[future]] = "completed"
+            if first_n is not None and len(results) >= first_n:
+                break
+        if first_n is not None and len(results) >= first_n:
+            break
 
-    with ThreadPoolExecutor() as executor:
-        futures = [executor.submit(invoke_agent, agent) for agent in agents]
-        results = [future.result() for future in as_completed(futures)]
+    if timed_out:
+        for future in pending:
+            statuses[futures[future]] = "timed_out"
+    report = token is not None or first_n is not None
 
     if aggregated:
-        final_state = State({})
-        for result in results:
-            final_state.update(result.data)
+        final_state = State(dict(base))
+        for index in sorted(results):
+            result = results[index]
+            if isinstance(result, StateDelta):
+                apply_delta(final_state, result, reducers)
+            else:
+                # Whole-State outputs hold final values, which must not go through the reducers again.
+                final_state.update(changed_keys(base, result))
+        if report:
+            final_state.update({STATUS_KEY: agent_statuses(agents, statuses)})
         return final_state
     else:
-        return results
\ No newline at end of file
+        final_states = []
+        for index in sorted(results):
+            result = results[index]
+            final_state = apply_delta(State(dict(base)), result, reducers) if isinstance(result, StateDelta) else result
+            if report:
+                final_state.update({STATUS_KEY: agent_statuses(agents, statuses)})
+            final_states.append(final_state)
+        return final_states
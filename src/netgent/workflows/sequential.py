@@ -1,14 +1,26 @@
-from typing import List
+from contextlib import nullcontext
+from typing import Dict, List, Optional
 from ..core.agent import Agent
 from ..core.state import State
+from ..core.cancellation import CancellationToken, DeadlineExceeded, STATUS_KEY, agent_name, agent_statuses, invoke_agent
+from ..core.memory import MemoryMonitor
+from ..core.reducers import Reducer, apply_result
 
-def sequential(agents: List[Agent], initial_state: State) -> State:
+def sequential(
+    agents: List[Agent],
+    initial_state: State,
+    token: Optional[CancellationToken] = None,
+    reducers: Optional[Dict[str, Reducer]] = None,
+    monitor: Optional[MemoryMonitor] = None
+) -> State:
     """
     Run agents sequentially and return the final state.
 
     This function implements the sequential processing workflow pattern
     as described in NetGent. It chains multiple agents for step-by-step
     processing, where each agent's output becomes the input for the next agent.
+    Agents may return a StateDelta with only the keys they changed, which is
+    applied to the running state with the given per-key reducers.
 
     Design:
     Initial ───► Agent1 ───► Agent2 ───► Agent3 ───► Final
@@ -17,14 +29,36 @@ def sequential(agents: List[Agent], initial_state: State) -> State:
     Args:
         agents (List[Agent]): A list of Agent objects to be executed sequentially.
         initial_state (State): The initial state to be passed to the first agent.
+        token (Optional[CancellationToken]): Request deadline/cancellation token. When it expires,
+            the remaining agents are skipped and the partial state is returned with a per-agent
+            status report under "agent_status". Default is None.
+        reducers (Optional[Dict[str, Reducer]]): Reducer per key used to apply StateDelta results.
+            Keys without a reducer are replaced. Default is None.
+        monitor (Optional[MemoryMonitor]): Records the peak memory of each agent step and the per-key
+            state sizes, and enforces its state-size limits after every step. Default is None.
 
     Returns:
         State: The final state after all agents have been executed.
 
     Example:
         result = sequential([agent1, agent2, agent3], initial_state)
+        partial = sequential([agent1, agent2, agent3], initial_state, token=CancellationToken(timeout=30))
     """
     current_state: State = initial_state
-    for agent in agents:
-        current_state = agent.invoke(current_state)
-    return current_state
\ No newline at end of file
+    statuses: List[str] = ["cancelled"] * len(agents)
+    for index, agent in enumerate(agents):
+        if token is not None and token.cancelled:
+            break
+        try:
+            with monitor.step(agent_name(agent)) if monitor is not None else nullcontext():
+                current_state = apply_result(current_state, invoke_agent(agent, current_state, token), reducers)
+        except DeadlineExceeded:
+            statuses[index] = "timed_out"
+            break
+        statuses[index] = "completed"
+        if monitor is not None:
+            monitor.enforce(current_state)
+
+    if token is not None:
+        current_state.update({STATUS_KEY: agent_statuses(agents, statuses)})
+    return current_state
@@ -0,0 +1,119 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+import wave
+from netgent.core.states import State
+from netgent.core.cancellation import CancellationToken, DeadlineExceeded, current_token, use_token
+from netgent.agents.cascade import CascadeAgent
+from netgent.agents.media import MediaPreprocessor
+
+class MockTextAgent:
+    def __init__(self, model_name: str, output: str, delay: float = 0.0):
+        self.model_name = model_name
+        self.output = output
+        self.delay = delay
+
+    def invoke(self, state: State) -> State:
+        time.sleep(self.delay)
+        state.update({"text_result": self.output})
+        return state
+
+class TestCascadeAgent(unittest.TestCase):
+    def test_accepts_cheapest_valid_result(self):
+        cascade = CascadeAgent([MockTextAgent("cheap", "ok"), MockTextAgent("expensive", "better")])
+        result_state = cascade.invoke(State({"input": "test"}))
+        self.assertEqual(result_state.get("text_result"), "ok")
+        self.assertEqual(cascade.get_stats()["accepted_by"], [1, 0])
+
+    def test_escalates_rejected_result(self):
+        cascade = CascadeAgent([MockTextAgent("cheap", ""), MockTextAgent("expensive", "better")])
+        initial_state = State({"input": "test"})
+        result_state = cascade.invoke(initial_state)
+        self.assertEqual(result_state.get("text_result"), "better")
+        self.assertFalse(initial_state.exists("text_result"))
+        self.assertEqual(cascade.get_stats()["escalations"], 1)
+
+    def test_hedges_slow_agent(self):
+        cascade = CascadeAgent(
+            [MockTextAgent("cheap", "slow", delay=0.5), MockTextAgent("expensive", "fast")],
+            hedge_after=0.05
+        )
+        result_state = cascade.invoke(State({"input": "test"}))
+        stats = cascade.get_stats()
+        self.assertEqual(result_state.get("text_result"), "fast")
+        self.assertEqual((stats["hedges"], stats["hedge_wins"]), (1, 1))
+        self.assertEqual(stats["accepted_by"], [0, 1])
+
+    def test_hedge_win_not_counted_for_original_tier(self):
+        cascade = CascadeAgent(
+            [MockTextAgent("cheap", "ok", delay=0.1), MockTextAgent("expensive", "late", delay=0.5)],
+            hedge_after=0.05
+        )
+        result_state = cascade.invoke(State({"input": "test"}))
+        stats = cascade.get_stats()
+        self.assertEqual(result_state.get("text_result"), "ok")
+        self.assertEqual((stats["hedges"], stats["hedge_wins"]), (1, 0))
+
+    def test_agents_see_request_token(self):
+        seen = []
+
+        class TokenAgent(MockTextAgent):
+            def invoke(self, state: State) -> State:
+                seen.append(current_token())
+                return super().invoke(state)
+
+        token = CancellationToken(timeout=5)
+        with use_token(token):
+            CascadeAgent([TokenAgent("cheap", "ok")]).invoke(State({}))
+        self.assertEqual(seen, [token])
+
+    def test_stops_at_deadline(self):
+        cascade = CascadeAgent([MockTextAgent("cheap", "slow", delay=1.0)])
+        started = time.monotonic()
+        with use_token(CancellationToken(timeout=0.1)):
+            with self.assertRaises(DeadlineExceeded):
+                cascade.invoke(State({}))
+        self.assertLess(time.monotonic() - started, 0.5)
+
+def make_wav(sample_rate: int = 8000, frames: int = 800) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(sample_rate)
+        writer.writeframes(b"\x00\x40" * frames)
+    return buffer.getvalue()
+
+class TestMediaPreprocessor(unittest.TestCase):
+    def test_decodes_and_resamples_audio(self):
+        preprocessor = MediaPreprocessor(sample_rate=16000)
+        delta = preprocessor.invoke(State({"audio_bytes": make_wav()}))
+        self.assertEqual(delta["audio"].shape, (1600,))
+        self.assertAlmostEqual(float(delta["audio"][0]), 0.5)
+        self.assertFalse(delta["audio"].flags.writeable)
+
+    def test_reuses_cached_buffer(self):
+        preprocessor = MediaPreprocessor()
+        first = preprocessor.invoke(State({"audio_bytes": make_wav()}))["audio"]
+        second = preprocessor.invoke(State({"audio_bytes": make_wav()}))["audio"]
+        self.assertIs(first, second)
+        self.assertEqual(preprocessor.cache.get_stats()["hits"], 1)
+        self.assertEqual(preprocessor.cache.get_stats()["misses"], 1)
+
+    def test_counts_one_lookup_per_path_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "audio.wav")
+            with open(path, "wb") as file:
+                file.write(make_wav())
+            preprocessor = MediaPreprocessor()
+            preprocessor.invoke(State({"audio_path": path}))
+            preprocessor.cache.clear()
+            preprocessor.invoke(State({"audio_path": path}))
+            preprocessor.invoke(State({"audio_path": path}))
+            stats = preprocessor.cache.get_stats()
+            self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,15 @@
+import os
+import tempfile
+import tracemalloc
 import unittest
+import numpy as np
 from netgent.core.state import State
 from netgent.core.agent import Agent
+from netgent.core.states import StateDelta
+from netgent.core.reducers import append, apply_delta, maximum
+from netgent.core.networks import NetworkAgent
+from netgent.core.incremental import ExecutionCache, fingerprint
+from netgent.core.memory import MemoryMonitor, SpilledValue, sizeof, state_sizes
 
 class TestState(unittest.TestCase):
     def test_state_update(self):
@@ -8,6 +17,16 @@ class TestState(unittest.TestCase):
         state.update({"b": 2})
         self.assertEqual(state.data, {"a": 1, "b": 2})
 
+class TestReducers(unittest.TestCase):
+    def test_apply_delta_with_reducers(self):
+        state = State({"log": ["a"], "score": 2, "text": "old"})
+        apply_delta(state, StateDelta({"log": ["b"], "score": 1, "text": "new"}), {"log": append, "score": maximum})
+        self.assertEqual(state.data, {"log": ["a", "b"], "score": 2, "text": "new"})
+
+    def test_apply_delta_missing_key(self):
+        state = apply_delta(State({}), StateDelta({"log": "a"}), {"log": append})
+        self.assertEqual(state.get("log"), ["a"])
+
 class MockAgent(Agent):
     def invoke(self, state: State) -> State:
         state.update({"processed": True})
@@ -20,5 +39,112 @@ class TestAgent(unittest.TestCase):
         result_state = agent.invoke(initial_state)
         self.assertTrue(result_state.get("processed"))
 
+class CountingAgent:
+    def __init__(self, input_key: str, output_key: str):
+        self.model_name = output_key
+        self.input_keys = [input_key]
+        self.output_key = output_key
+        self.calls = 0
+
+    def invoke(self, state: State) -> StateDelta:
+        self.calls += 1
+        return StateDelta({self.output_key: state.get(self.input_keys[0])})
+
+class TestIncrementalNetwork(unittest.TestCase):
+    def test_reruns_only_changed_agents(self):
+        first = CountingAgent("a", "b")
+        second = CountingAgent("c", "d")
+        network = NetworkAgent([first, second], cache=ExecutionCache())
+        network.invoke(State({"a": 1, "c": 1}))
+        result_state = network.invoke(State({"a": 1, "c": 2}))
+        self.assertEqual(result_state.data, {"a": 1, "c": 2, "b": 1, "d": 2})
+        self.assertEqual((first.calls, second.calls), (1, 2))
+
+    def test_runs_agents_appended_after_first_call(self):
+        network = NetworkAgent([CountingAgent("a", "b")], cache=ExecutionCache())
+        network.invoke(State({"a": 1}))
+        network.get_agents().append(CountingAgent("b", "c"))
+        self.assertEqual(network.invoke(State({"a": 1})).get("c"), 1)
+
+    def test_fingerprint_separates_fields(self):
+        self.assertNotEqual(
+            fingerprint(State({"a": b"", "b": b"bc"}), ["a", "b"]),
+            fingerprint(State({"a": b"b", "b": b"c"}), ["a", "b"])
+        )
+        self.assertNotEqual(fingerprint(State({"a": b""}), ["a"]), fingerprint(State({}), ["a"]))
+
+class TestMemoryMonitor(unittest.TestCase):
+    def test_state_sizes(self):
+        sizes = state_sizes(State({"small": "a", "large": "a" * 10000}))
+        self.assertGreater(sizes["large"], 10000)
+        self.assertLess(sizes["small"], 100)
+
+    def test_counts_array_buffers_once(self):
+        array = np.zeros(1000000, dtype=np.uint8)
+        self.assertLess(sizeof(array), 1001000)
+        self.assertGreaterEqual(sizeof(array[::2]), 500000)
+
+    def test_evicts_oversized_values(self):
+        monitor = MemoryMonitor(max_value_bytes=1000, protected_keys=["input"])
+        state = monitor.enforce(State({"input": "a" * 5000, "vision_result": "b" * 5000, "text": "c"}))
+        self.assertEqual(set(state.data), {"input", "text"})
+        self.assertEqual(monitor.get_stats()["evicted"], {"vision_result": 1})
+
+    def test_spills_oversized_values(self):
+        with tempfile.TemporaryDirectory() as directory:
+            monitor = MemoryMonitor(max_total_bytes=1000, spill_dir=directory)
+            state = monitor.enforce(State({"transcript": "a" * 5000}))
+            self.assertIsInstance(state.get("transcript"), SpilledValue)
+            self.assertEqual(state.get("transcript").load(), "a" * 5000)
+            monitor.close()
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_protected_keys_do_not_count_against_total(self):
+        monitor = MemoryMonitor(max_total_bytes=1000, protected_keys=["input"])
+        state = monitor.enforce(State({"input": "a" * 5000, "text_result": "b", "prompt": "c"}))
+        self.assertEqual(set(state.data), {"input", "text_result", "prompt"})
+
+    def test_close_stops_tracing(self):
+        monitor = MemoryMonitor(track_peak=True)
+        with monitor.step("agent"):
+            [0] * 1000
+        monitor.close()
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertEqual(monitor.get_stats()["steps"]["agent"]["calls"], 1)
+
+class AppendingAgent:
+    model_name = "appender"
+    input_keys = ["input"]
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, state: State) -> State:
+        self.calls += 1
+        state.update({"log": state.get("log") + ["w"]})
+        return state
+
+class TestIncrementalWholeState(unittest.TestCase):
+    def test_cache_hit_does_not_reapply_reducers(self):
+        agent = AppendingAgent()
+        network = NetworkAgent([agent], reducers={"log": append}, cache=ExecutionCache())
+        first = network.invoke(State({"input": "x", "log": ["s"]}))
+        second = network.invoke(State({"input": "x", "log": ["s"]}))
+        self.assertEqual(first.get("log"), ["s", "w"])
+        self.assertEqual(second.get("log"), ["s", "w"])
+        self.assertEqual(agent.calls, 1)
+
+    def test_cache_hit_replays_deletions(self):
+        class DeletingAgent(AppendingAgent):
+            def invoke(self, state: State) -> State:
+                state.delete("tmp")
+                return super().invoke(state)
+
+        network = NetworkAgent([DeletingAgent()], cache=ExecutionCache())
+        first = network.invoke(State({"input": "x", "log": [], "tmp": 1}))
+        second = network.invoke(State({"input": "x", "log": [], "tmp": 1}))
+        self.assertEqual(first.data, second.data)
+        self.assertFalse(second.exists("tmp"))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
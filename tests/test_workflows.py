@@ -0,0 +1,157 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from netgent.core.states import State, StateDelta
+from netgent.core.cancellation import CancellationToken
+from netgent.core.reducers import append
+from netgent.workflows.parallel import parallel
+from netgent.workflows.sequential import sequential
+from netgent.workflows.batch import batch
+from netgent.core.networks import NetworkAgent
+
+class MockAgent:
+    def __init__(self, model_name: str, delay: float = 0.0):
+        self.model_name = model_name
+        self.delay = delay
+
+    def invoke(self, state: State) -> State:
+        time.sleep(self.delay)
+        state.update({self.model_name: True})
+        return state
+
+class TestDeadlines(unittest.TestCase):
+    def test_sequential_returns_partial_state(self):
+        agents = [MockAgent("fast"), MockAgent("slow", delay=1.0), MockAgent("never")]
+        result_state = sequential(agents, State({"input": "test"}), token=CancellationToken(timeout=0.1))
+        self.assertTrue(result_state.get("fast"))
+        self.assertFalse(result_state.exists("never"))
+        self.assertEqual(
+            [entry["status"] for entry in result_state.get("agent_status")],
+            ["completed", "timed_out", "cancelled"]
+        )
+
+    def test_parallel_first_n(self):
+        agents = [MockAgent("fast"), MockAgent("slow", delay=1.0)]
+        result_state = parallel(agents, State({"input": "test"}), aggregated=True, first_n=1)
+        self.assertTrue(result_state.get("fast"))
+        self.assertEqual(result_state.get("agent_status")[0]["status"], "completed")
+
+    def test_parallel_abandoned_agents_do_not_touch_input(self):
+        initial_state = State({"input": "test"})
+        results = parallel([MockAgent("fast"), MockAgent("slow", delay=0.2)], initial_state, first_n=1)
+        time.sleep(0.4)
+        self.assertEqual(initial_state.data, {"input": "test"})
+        self.assertIsNot(results[0], initial_state)
+        self.assertFalse(results[0].exists("slow"))
+
+    def test_parallel_cancel_without_deadline(self):
+        token = CancellationToken()
+        timer = threading.Timer(0.1, token.cancel)
+        timer.start()
+        started = time.monotonic()
+        result_state = parallel([MockAgent("slow", delay=1.0)], State({}), aggregated=True, token=token)
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(result_state.get("agent_status")[0]["status"], "timed_out")
+
+    def test_parallel_list_reports_statuses(self):
+        agents = [MockAgent("fast"), MockAgent("slow", delay=1.0)]
+        results = parallel(agents, State({}), token=CancellationToken(timeout=0.1))
+        self.assertEqual(len(results), 1)
+        self.assertEqual(
+            [entry["status"] for entry in results[0].get("agent_status")],
+            ["completed", "timed_out"]
+        )
+
+    def test_parallel_abandoned_agents_hold_limiter(self):
+        limiter = threading.BoundedSemaphore(1)
+        parallel([MockAgent("slow", delay=0.3)], State({}), token=CancellationToken(timeout=0.05, limiter=limiter))
+        self.assertFalse(limiter.acquire(blocking=False))
+        time.sleep(0.4)
+        self.assertTrue(limiter.acquire(blocking=False))
+
+class DeltaAgent:
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def invoke(self, state: State) -> StateDelta:
+        return StateDelta({"log": [self.model_name]})
+
+class TestDeltas(unittest.TestCase):
+    def test_sequential_applies_deltas(self):
+        result_state = sequential([DeltaAgent("a"), DeltaAgent("b")], State({"log": []}), reducers={"log": append})
+        self.assertEqual(result_state.get("log"), ["a", "b"])
+
+    def test_parallel_merges_in_agent_order(self):
+        agents = [DeltaAgent("a"), DeltaAgent("b"), DeltaAgent("c")]
+        result_state = parallel(agents, State({"log": []}), aggregated=True, reducers={"log": append})
+        self.assertEqual(result_state.get("log"), ["a", "b", "c"])
+
+class DoublingAgent:
+    def invoke(self, state: State) -> StateDelta:
+        return StateDelta({"y": state.get("x") * 2})
+
+class WholeStateAgent:
+    def __init__(self, model_name: str, delay: float = 0.0):
+        self.model_name = model_name
+        self.delay = delay
+
+    def invoke(self, state: State) -> State:
+        time.sleep(self.delay)
+        state.update({"text_result": self.model_name, "log": state.get("log") + [self.model_name]})
+        return state
+
+class TestWholeStateMerge(unittest.TestCase):
+    def test_parallel_merges_whole_states_in_agent_order(self):
+        agents = [WholeStateAgent("a", delay=0.1), WholeStateAgent("b")]
+        initial_state = State({"log": []})
+        result_state = parallel(agents, initial_state, aggregated=True)
+        self.assertEqual(result_state.get("text_result"), "b")
+        self.assertEqual(result_state.get("log"), ["b"])
+        self.assertEqual(initial_state.data, {"log": []})
+
+    def test_parallel_does_not_reduce_whole_states(self):
+        agents = [WholeStateAgent("a"), WholeStateAgent("b")]
+        result_state = parallel(agents, State({"log": ["s"]}), aggregated=True, reducers={"log": append})
+        self.assertEqual(result_state.get("log"), ["s", "b"])
+
+class TestBatch(unittest.TestCase):
+    def test_batch_resumes_from_output(self):
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = os.path.join(directory, "input.jsonl")
+            output_path = os.path.join(directory, "output.jsonl")
+            with open(input_path, "w") as file:
+                file.write("".join(json.dumps({"x": x}) + "\n" for x in range(5)))
+            with open(output_path, "w") as file:
+                file.write(json.dumps({"index": 0, "status": "ok", "state": {"x": 0, "y": 0}}) + "\n{\"index\": 1")
+
+            stats = batch(DoublingAgent(), input_path, output_path, concurrency=2)
+
+            with open(output_path) as file:
+                records = [json.loads(line) for line in file]
+            self.assertEqual(stats["skipped"], 1)
+            self.assertEqual(stats["processed"], 4)
+            self.assertEqual([record["index"] for record in records], [0, 1, 2, 3, 4])
+            self.assertEqual(records[4]["state"]["y"], 8)
+
+    def test_batch_bounds_abandoned_calls(self):
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = os.path.join(directory, "input.jsonl")
+            output_path = os.path.join(directory, "output.jsonl")
+            with open(input_path, "w") as file:
+                file.write("".join(json.dumps({"x": x}) + "\n" for x in range(10)))
+
+            threads_before = threading.active_count()
+            stats = batch(NetworkAgent([MockAgent("hung", delay=1.0)]), input_path, output_path, concurrency=2, timeout=0.05)
+            self.assertLessEqual(threading.active_count() - threads_before, 2)
+
+            with open(output_path) as file:
+                records = [json.loads(line) for line in file]
+            self.assertEqual(stats["failed"], 10)
+            self.assertEqual(records[0]["status"], "timed_out")
+            self.assertEqual(records[0]["state"]["agent_status"][0]["status"], "timed_out")
+
+if __name__ == '__main__':
+    unittest.main()